@@ -6,7 +6,6 @@ import functools
 import sys
 from typing import Tuple, Any, List
 from types import FunctionType
-from time import sleep
 from typing import Dict, Union, Tuple, Optional
 from uuid import uuid4 as uuid
 import re
@@ -14,6 +13,13 @@ import atexit
 import curses
 import logging
 import traceback
+import struct
+import os
+import stat
+import bisect
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, CancelledError
 
 
 class WindowError(BaseException):
@@ -75,21 +81,27 @@ class ShortcutManager:
             raise ShortcutDeletionError("Shortcut could not be deleted")
 
     def check_shortcuts(self):
+        """
+        Handles every key queued since the last frame. Held down keys queue up faster than frames are drawn,
+        so handling them all here keeps the screen from falling behind the keyboard
+        """
         key = self.parent.getch(False)
-        if key == -1:
-            return
-        handler = self.shortcuts.get(key)
-        # Close all other shortcut handlers
-        for shortcut in self.shortcuts.values():
-            if shortcut[1] is not None:
-                shortcut[1]()
-        if handler is not None:
-            handler[0]()
-        else:
-            curses.ungetch(key)
+        while key != -1:
+            handler = self.shortcuts.get(key)
+            # Close all other shortcut handlers
+            for shortcut in self.shortcuts.values():
+                if shortcut[1] is not None:
+                    shortcut[1]()
+            if handler is not None:
+                handler[0]()
+            # Keys are dispatched as they're read, so a handler that prompts for input gets the keys after it
+            key = self.parent.getch(False, 0)
 
 
 class App:
+    # How long a frame waits for input before redrawing, in milliseconds
+    FRAME_TIMEOUT = 50
+
     def __init__(self, menubar: bool = False, footerbar: bool = False):
         self.windows = {}  # type: Dict[str, Window]
         self.screen = Screen()
@@ -128,7 +140,11 @@ class App:
             return self.menubar.window.getkey()
         raise NoWindowsError("No windows were found to fetch key value from")
 
-    def getch(self, blocking=True):
+    def getch(self, blocking=True, timeout: int = None):
+        """
+        Gets a key. When not blocking, waits up to :code:`timeout` milliseconds (:code:`FRAME_TIMEOUT` by
+        default) and returns -1 if no key was pressed
+        """
         if len(self.windows) == 0:
             raise NoWindowsError("No windows were found to fetch key value from")
         for window in self.windows.values():
@@ -137,17 +153,12 @@ class App:
                 window.window.nodelay(False)
                 rval = window.window.getch()
             else:
-                window.window.nodelay(True)
-                curses.cbreak(True)
+                window.window.timeout(self.FRAME_TIMEOUT if timeout is None else timeout)
                 try:
-                    sleep(0.2)
                     rval = window.window.getch()
-                    window.window.nodelay(False)
-                    curses.flushinp()
                 except curses.error:
-                    window.window.nodelay(False)
-                    curses.flushinp()
-                    return -1
+                    rval = -1
+                window.window.timeout(-1)
             return rval
 
     def refresh(self):
@@ -162,12 +173,17 @@ class App:
     def run(self):
         """Core loop that runs everything"""
         while True:
+            self.shortcut_manager.check_shortcuts()
             for window in self.windows.values():
                 try:
                     window.draw()
                 except NotImplementedError:
                     pass
-            self.shortcut_manager.check_shortcuts()
+                for sub_window in window.sub_windows.values():
+                    try:
+                        sub_window.draw()
+                    except NotImplementedError:
+                        pass
             self.refresh()
 
     def add_keyboard_shortcut(self, key: int, action: FunctionType):
@@ -280,12 +296,15 @@ class Window:
         else:
             self.window.addstr(text)
 
-    def add_subwindow(self, name: str, cols: int, lines: int, beg_y: int, beg_x: int, win_id: str = None) -> 'Window':
+    def add_subwindow(self, name: str, cols: int, lines: int, beg_y: int, beg_x: int, win_id: str = None,
+                      window_cls: type = None) -> 'Window':
         """
-        Adds a subwindow to the current window. :param:`beg_y` and :param:`beg_x` are relative to the parent window
+        Adds a subwindow to the current window. :param:`beg_y` and :param:`beg_x` are relative to the parent window.
+        :param:`window_cls` can be used to create the subwindow as a :code:`Window` subclass
         """
+        window_cls = window_cls if window_cls is not None else Window
         nwin = self.window.derwin(lines, cols, beg_y, beg_x)
-        nwin = Window.from_derived_window(nwin, name)
+        nwin = window_cls.from_derived_window(nwin, name)
         nwin.parent = self
         self.sub_windows[name] = nwin
         return nwin
@@ -352,13 +371,30 @@ class FooterBar(Window):
         self.window.noutrefresh()
 
     def draw(self):
+        # Items that don't fit on narrow terminals are left off rather than written past the edge
         for menuitem in self.items:
-            menuitem.draw()
+            if menuitem.end_x < self.window.getmaxyx()[1]:
+                menuitem.draw()
+
+    def prompt(self, text: str) -> str:
+        """
+        Shows :code:`text` in the footer and reads a line of input from the user
+        """
+        self.erase()
+        self.add_str(text, 0, 0)
+        curses.echo()
+        self.window.timeout(-1)
+        try:
+            rval = self.window.getstr(0, len(text)).decode("utf-8", "replace")
+        finally:
+            curses.noecho()
+            self.erase()
+        return rval
 
     def add_item(self, item_name: str, handler: FunctionType, key: int):
         key = key if key is not None else curses.KEY_F63
         temp = FooterItem(item_name, key, self._get_next_x(), self, handler)
-        self.parent.shortcut_manager.add_shortcut(key, functools.partial(temp.function))
+        self.parent.shortcut_manager.add_shortcut(key, functools.partial(temp.function), None)
         self.items.append(temp)
 
 
@@ -439,13 +475,605 @@ class FooterItem:
         return curses.keyname(self.key).replace(b'KEY_', b'').decode('ascii')
 
 
+class DataSource:
+    """
+    Base class for the data shown in the hex view. Data is read in aligned blocks which are kept in an LRU
+    cache, and a background thread reads ahead of the view in the direction it is scrolling, so scrolling
+    is served from the cache instead of waiting on a syscall. Subclasses implement :code:`_read_block`
+    """
+    BLOCK_SIZE = 4096
+    CACHE_BLOCKS = 512
+    PREFETCH_BLOCKS = 16
+
+    def __init__(self):
+        self.size = 0
+        self._blocks = OrderedDict()  # type: OrderedDict[int, Optional[bytes]]
+        self._pending = {}  # type: Dict[int, Future]
+        self._lock = threading.Lock()
+        # Bumped whenever the cache is invalidated
+        self._generation = 0
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def _read_block(self, index: int) -> Optional[bytes]:
+        """
+        Reads block :code:`index` from the underlying data
+
+        Returns:
+            Optional[bytes]: The block data, or :code:`None` if the block is a hole that can't be read
+        """
+        raise NotImplementedError("Implement _read_block for your data source")
+
+    def _store_block(self, index: int, data: Optional[bytes], generation: int):
+        with self._lock:
+            # Reads that were already running when the cache was invalidated hold old data
+            if generation != self._generation:
+                return
+            self._blocks[index] = data
+            self._blocks.move_to_end(index)
+            while len(self._blocks) > self.CACHE_BLOCKS:
+                self._blocks.popitem(last=False)
+            self._pending.pop(index, None)
+
+    def _fetch_block(self, index: int) -> Optional[bytes]:
+        generation = self._generation
+        data = self._read_block(index)
+        self._store_block(index, data, generation)
+        return data
+
+    def block(self, index: int) -> Optional[bytes]:
+        """
+        Gets block :code:`index`, from the cache if possible. If the block is already being prefetched,
+        waits for that read rather than issuing a second one
+        """
+        with self._lock:
+            if index in self._blocks:
+                self._blocks.move_to_end(index)
+                return self._blocks[index]
+            future = self._pending.get(index)
+        if future is not None:
+            try:
+                return future.result()
+            except CancelledError:
+                pass
+        return self._fetch_block(index)
+
+    def read(self, offset: int, length: int) -> bytes:
+        """
+        Reads :code:`length` bytes from :code:`offset`. Holes are returned as zero bytes, use :code:`holes`
+        to find them
+
+        Returns:
+            bytes: The data, truncated at the end of the source
+        """
+        end = min(offset + length, self.size)
+        if offset >= end:
+            return b""
+        first, last = offset // self.BLOCK_SIZE, (end - 1) // self.BLOCK_SIZE
+        chunks = []
+        for index in range(first, last + 1):
+            block_length = min(self.BLOCK_SIZE, self.size - index * self.BLOCK_SIZE)
+            data = self.block(index)
+            if data is None:
+                data = bytes(block_length)
+            elif len(data) < block_length:
+                data += bytes(block_length - len(data))
+            chunks.append(data)
+        start = offset - first * self.BLOCK_SIZE
+        return b"".join(chunks)[start:start + end - offset]
+
+    def holes(self, offset: int, length: int) -> Tuple[Tuple[int, int], ...]:
+        """
+        Finds the holes between :code:`offset` and :code:`offset + length`
+
+        Returns:
+            Tuple[Tuple[int, int], ...]: (start, end) ranges relative to :code:`offset`
+        """
+        end = min(offset + length, self.size)
+        if offset >= end:
+            return ()
+        rval = []
+        for index in range(offset // self.BLOCK_SIZE, (end - 1) // self.BLOCK_SIZE + 1):
+            if self.block(index) is not None:
+                continue
+            hole_start = max(index * self.BLOCK_SIZE, offset) - offset
+            hole_end = min((index + 1) * self.BLOCK_SIZE, end) - offset
+            if rval and rval[-1][1] == hole_start:
+                rval[-1] = (rval[-1][0], hole_end)
+            else:
+                rval.append((hole_start, hole_end))
+        return tuple(rval)
+
+    def next_mapped(self, offset: int, direction: int) -> int:
+        """
+        Gets the closest readable offset to :code:`offset`, searching forwards if :code:`direction` is
+        positive and backwards otherwise. Sources without holes return :code:`offset`
+        """
+        return offset
+
+    def prefetch(self, offset: int, length: int, direction: int):
+        """
+        Queues background reads for the blocks past the visible range, in the direction of scrolling.
+        Queued reads outside the new read-ahead window, left over from the other direction or from before
+        a jump, are cancelled
+
+        Args:
+            offset (int): Start of the visible range
+            length (int): Length of the visible range
+            direction (int): Positive when scrolling forwards, negative backwards, zero to do nothing
+        """
+        if direction > 0:
+            first = (offset + length) // self.BLOCK_SIZE
+            indices = range(first, first + self.PREFETCH_BLOCKS)
+        elif direction < 0:
+            last = offset // self.BLOCK_SIZE
+            indices = range(last - 1, last - 1 - self.PREFETCH_BLOCKS, -1)
+        else:
+            return
+        last_index = (self.size - 1) // self.BLOCK_SIZE
+        with self._lock:
+            for index in [index for index in self._pending if index not in indices]:
+                self._pending.pop(index).cancel()
+            for index in indices:
+                if index < 0 or index > last_index or index in self._blocks or index in self._pending:
+                    continue
+                self._pending[index] = self._executor.submit(self._fetch_block, index)
+
+    def cancel_prefetch(self):
+        """
+        Cancels queued prefetches that haven't started yet
+        """
+        with self._lock:
+            for future in self._pending.values():
+                future.cancel()
+            self._pending.clear()
+
+    def invalidate(self):
+        """
+        Drops cached blocks and queued prefetches, so the next read sees fresh data
+        """
+        self.cancel_prefetch()
+        with self._lock:
+            self._generation += 1
+            self._blocks.clear()
+
+    def close(self):
+        self.cancel_prefetch()
+        # Wait for a read that has already started, subclasses close the file it's reading from
+        self._executor.shutdown(wait=True)
+
+
+class FileSource(DataSource):
+    """
+    Reads data for the hex view from a regular file
+    """
+    def __init__(self, path: str):
+        super(FileSource, self).__init__()
+        self.path = path
+        self._fd = os.open(path, os.O_RDONLY)
+        self.size = os.fstat(self._fd).st_size
+
+    def _read_block(self, index: int) -> Optional[bytes]:
+        return os.pread(self._fd, self.BLOCK_SIZE, index * self.BLOCK_SIZE)
+
+    def close(self):
+        super(FileSource, self).close()
+        os.close(self._fd)
+
+
+class BlockDeviceSource(FileSource):
+    """
+    Reads data from a block device. Reads are always whole, block aligned :code:`pread` calls, and the
+    size comes from seeking to the end as :code:`st_size` is 0 for devices
+    """
+    def __init__(self, path: str):
+        super(BlockDeviceSource, self).__init__(path)
+        self.size = os.lseek(self._fd, 0, os.SEEK_END)
+
+    def _read_block(self, index: int) -> Optional[bytes]:
+        try:
+            return os.pread(self._fd, self.BLOCK_SIZE, index * self.BLOCK_SIZE)
+        except OSError:
+            return None
+
+
+class ProcessMemorySource(DataSource):
+    """
+    Reads the memory of a live process through :code:`/proc/<pid>/mem`. Only the readable mappings listed
+    in :code:`/proc/<pid>/maps` are read, everything else is a hole
+    """
+    def __init__(self, pid: int):
+        super(ProcessMemorySource, self).__init__()
+        self.pid = pid
+        self._fd = os.open("/proc/{}/mem".format(pid), os.O_RDONLY)
+        # The mappings and their start addresses, kept together so the prefetch thread never sees one
+        # updated without the other
+        self._mappings = ([], [])  # type: Tuple[List[Tuple[int, int, str]], List[int]]
+        self.load_maps()
+
+    @property
+    def maps(self) -> List[Tuple[int, int, str]]:
+        """
+        The readable mappings of the process as (start, end, path) tuples, sorted by address
+        """
+        return self._mappings[0]
+
+    def load_maps(self):
+        """
+        Reads the readable mappings of the process from :code:`/proc/<pid>/maps`. If the process has exited
+        the old mappings are kept, reads from them fail and are shown as holes
+        """
+        maps = []
+        try:
+            with open("/proc/{}/maps".format(self.pid)) as f:
+                for line in f:
+                    fields = line.split(maxsplit=5)
+                    if not fields[1].startswith("r"):
+                        continue
+                    start, end = (int(address, 16) for address in fields[0].split("-"))
+                    maps.append((start, end, fields[5].strip() if len(fields) > 5 else ""))
+        except OSError:
+            return
+        maps.sort()
+        with self._lock:
+            self._mappings = (maps, [mapping[0] for mapping in maps])
+            self.size = maps[-1][1] if maps else 0
+
+    def _read_block(self, index: int) -> Optional[bytes]:
+        maps, starts = self._mappings
+        start = index * self.BLOCK_SIZE
+        i = bisect.bisect_right(starts, start) - 1
+        if i < 0 or start >= maps[i][1]:
+            return None
+        try:
+            data = os.pread(self._fd, min(self.BLOCK_SIZE, maps[i][1] - start), start)
+        except (OSError, OverflowError):
+            # Some mappings, such as [vvar] or addresses past the end of off_t, can't be read
+            return None
+        # Reads return nothing once the process has exited
+        return data if data else None
+
+    def next_mapped(self, offset: int, direction: int) -> int:
+        maps, starts = self._mappings
+        if not maps:
+            return offset
+        i = bisect.bisect_right(starts, offset) - 1
+        if i >= 0 and offset < maps[i][1]:
+            return offset
+        # Fall back to the other direction when there is nothing mapped past offset
+        if (direction > 0 and i + 1 < len(maps)) or i < 0:
+            return maps[i + 1][0]
+        return maps[i][1] - 1
+
+    def invalidate(self):
+        super(ProcessMemorySource, self).invalidate()
+        self.load_maps()
+
+    def close(self):
+        super(ProcessMemorySource, self).close()
+        os.close(self._fd)
+
+
+def open_source(path: str) -> DataSource:
+    """
+    Opens :code:`path` with the matching data source. :code:`/proc/<pid>/mem` opens the memory of that
+    process, block devices are read with :code:`BlockDeviceSource`, anything else is read as a file
+    """
+    match = re.fullmatch(r"/proc/(\d+)/mem", path)
+    if match is not None:
+        return ProcessMemorySource(int(match.group(1)))
+    if stat.S_ISBLK(os.stat(path).st_mode):
+        return BlockDeviceSource(path)
+    return FileSource(path)
+
+
+class DataInspector:
+    """
+    Decodes pages of data as typed columns. A whole page is decoded with a single :code:`struct.unpack`
+    call and the formatted rows are cached, so redrawing or switching back to an interpretation is cheap
+    """
+    # mode: (struct code, cell width, cell format)
+    FORMATS = {
+        "hex": ("B", 2, "{:02X}"),
+        "int8": ("b", 4, "{:>4d}"),
+        "int16": ("h", 6, "{:>6d}"),
+        "int32": ("i", 11, "{:>11d}"),
+        "int64": ("q", 20, "{:>20d}"),
+        "float32": ("f", 11, "{:>11.5g}"),
+        "float64": ("d", 22, "{:>22.15g}"),
+    }
+    MODES = tuple(FORMATS.keys()) + ("inspector",)
+    INSPECTOR_TYPES = (
+        ("int8", "b"), ("uint8", "B"),
+        ("int16", "h"), ("uint16", "H"),
+        ("int32", "i"), ("uint32", "I"),
+        ("int64", "q"), ("uint64", "Q"),
+        ("float32", "f"), ("float64", "d"),
+    )
+    ENDIANNESS = {"<": "LE", ">": "BE"}
+    # Maps non-printable bytes to "." for the text pane
+    PRINTABLE = bytes(b if 32 <= b < 127 else ord(".") for b in range(256))
+    MAX_ROW_BYTES = 16
+
+    @staticmethod
+    def row_bytes(mode: str, width: int) -> int:
+        """
+        Gets the number of bytes shown per row for :code:`mode` in a pane :code:`width` columns wide
+
+        Args:
+            mode (str): The display mode
+            width (int): Width of the pane
+
+        Returns:
+            int: Bytes per row, a power of two that is a multiple of the item size
+        """
+        code, cell_width, _ = DataInspector.FORMATS.get(mode, DataInspector.FORMATS["hex"])
+        size = struct.calcsize(code)
+        row_bytes = DataInspector.MAX_ROW_BYTES
+        # Leave the last column free, curses errors when writing to the bottom right corner
+        while row_bytes > size and (row_bytes // size) * (cell_width + 1) > width:
+            row_bytes //= 2
+        return row_bytes
+
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def format_page(page: bytes, mode: str, endian: str, row_bytes: int,
+                    holes: Tuple[Tuple[int, int], ...] = ()) -> Tuple[Tuple[str, str], ...]:
+        """
+        Decodes :code:`page` as :code:`mode` values and formats it into rows
+
+        Args:
+            page (bytes): The page data, starting at the first visible row
+            mode (str): The display mode, a key of :code:`FORMATS`
+            endian (str): :code:`"<"` or :code:`">"`
+            row_bytes (int): Bytes per row
+            holes (Tuple[Tuple[int, int], ...]): (start, end) ranges of :code:`page` that couldn't be read
+
+        Returns:
+            Tuple[Tuple[str, str], ...]: A tuple of (typed row, text row) pairs
+        """
+        code, cell_width, cell_format = DataInspector.FORMATS[mode]
+        size = struct.calcsize(code)
+        count = len(page) // size
+        values = struct.unpack(endian + str(count) + code, page[:count * size])
+        per_row = row_bytes // size
+        row_format = " ".join([cell_format] * per_row)
+        text = page.translate(DataInspector.PRINTABLE).decode("ascii")
+        hole_cell = "??".rjust(cell_width)
+        rows = []
+        for start in range(0, len(page), row_bytes):
+            row_values = values[start // size:start // size + per_row]
+            row_text = text[start:start + row_bytes]
+            row_holes = [hole for hole in holes if hole[0] < start + row_bytes and hole[1] > start]
+            if row_holes:
+                cells = []
+                for i, value in enumerate(row_values):
+                    cell_start = start + i * size
+                    if any(hole[0] < cell_start + size and hole[1] > cell_start for hole in row_holes):
+                        cells.append(hole_cell)
+                    else:
+                        cells.append(cell_format.format(value))
+                typed = " ".join(cells)
+                row_text = "".join(
+                    " " if any(hole[0] <= start + i < hole[1] for hole in row_holes) else char
+                    for i, char in enumerate(row_text))
+            elif len(row_values) == per_row:
+                typed = row_format.format(*row_values)
+            else:
+                typed = " ".join([cell_format] * len(row_values)).format(*row_values)
+            rows.append((typed, row_text))
+        return tuple(rows)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def inspect(data: bytes, endian: str) -> Tuple[str, ...]:
+        """
+        Interprets the bytes at the cursor as each of :code:`INSPECTOR_TYPES`
+
+        Args:
+            data (bytes): At least 8 bytes from the cursor, less at the end of the data
+            endian (str): :code:`"<"` or :code:`">"`
+
+        Returns:
+            Tuple[str, ...]: One line per type
+        """
+        lines = []
+        for name, code in DataInspector.INSPECTOR_TYPES:
+            if len(data) < struct.calcsize(code):
+                value = "--"
+            else:
+                value = struct.unpack_from(endian + code, data)[0]
+            lines.append("{:<8} {}".format(name, value))
+        return tuple(lines)
+
+
+class HexWindow(Window):
+    @classmethod
+    def from_derived_window(cls, window, name=None) -> 'HexWindow':
+        nwin = super(HexWindow, cls).from_derived_window(window, name)
+        nwin.source = None
+        nwin.text_window = None  # type: Optional[Window]
+        nwin.mode = "hex"
+        nwin.endian = "<"
+        nwin.offset = 0
+        nwin.cursor = 0
+        nwin._drawn_offset = 0
+        nwin.pending_delta = 0
+        nwin.pending_scroll = 0
+        return nwin
+
+    def _page_geometry(self) -> Tuple[int, int, int]:
+        lines, cols = self.window.getmaxyx()
+        row_bytes = DataInspector.row_bytes(self.mode, cols)
+        # One line for the header, and the inspector takes a line per type plus a separator
+        rows = lines - 1
+        if self.mode == "inspector":
+            rows -= len(DataInspector.INSPECTOR_TYPES) + 1
+        return row_bytes, max(rows, 1), row_bytes * max(rows, 1)
+
+    def set_source(self, source: DataSource):
+        if self.source is not None:
+            self.source.close()
+        self.source = source
+        self.cursor = source.next_mapped(0, 1)
+        self.offset = self.cursor - self.cursor % DataInspector.MAX_ROW_BYTES
+        self._drawn_offset = self.offset
+        self.pending_delta = 0
+        self.pending_scroll = 0
+
+    def reload(self):
+        """
+        Drops cached data so that changes to the source, such as a live process writing to its memory,
+        are shown
+        """
+        if self.source is not None:
+            self.source.invalidate()
+
+    def cycle_mode(self):
+        modes = DataInspector.MODES
+        self.mode = modes[(modes.index(self.mode) + 1) % len(modes)]
+
+    def toggle_endian(self):
+        self.endian = ">" if self.endian == "<" else "<"
+
+    def item_size(self) -> int:
+        code = DataInspector.FORMATS.get(self.mode, DataInspector.FORMATS["hex"])[0]
+        return struct.calcsize(code)
+
+    def move_cursor(self, delta: int):
+        """
+        Moves the cursor by :code:`delta` bytes, scrolling the page to keep it visible
+        """
+        if self.source is None:
+            return
+        self.cursor = min(max(self.cursor + delta, 0), max(self.source.size - 1, 0))
+        self.cursor = self.source.next_mapped(self.cursor, delta)
+        self._scroll_to_cursor()
+
+    def scroll(self, delta: int):
+        """
+        Moves the page by :code:`delta` bytes without moving the cursor, stopping when the last row of the
+        source reaches the bottom of the page
+        """
+        if self.source is None:
+            return
+        row_bytes, _, page_bytes = self._page_geometry()
+        last_row = max(self.source.size - 1, 0) // row_bytes * row_bytes
+        self.offset = min(max(self.offset + delta, 0), max(last_row - page_bytes + row_bytes, 0))
+
+    def _scroll_to_cursor(self):
+        """
+        Scrolls the page as little as possible to bring the cursor into view
+        """
+        row_bytes, _, page_bytes = self._page_geometry()
+        self.offset -= self.offset % row_bytes
+        if self.cursor < self.offset:
+            self.offset = self.cursor - self.cursor % row_bytes
+        elif self.cursor >= self.offset + page_bytes:
+            self.offset = self.cursor - self.cursor % row_bytes - page_bytes + row_bytes
+
+    # Navigation keys add to pending_delta rather than moving straight away, so all the keys handled in a
+    # frame are applied as one net move when the window is next drawn
+
+    def move_rows(self, rows: int):
+        self.pending_delta += rows * self._page_geometry()[0]
+
+    def move_pages(self, pages: int):
+        # The page moves with the cursor, rather than scrolling just far enough to keep it in view
+        page_bytes = self._page_geometry()[2]
+        self.pending_delta += pages * page_bytes
+        self.pending_scroll += pages * page_bytes
+
+    def move_items(self, items: int):
+        self.pending_delta += items * self.item_size()
+
+    def goto(self, target: str):
+        """
+        Moves the cursor straight to :code:`target`, skipping the pages in between. :code:`target` is an
+        offset such as :code:`4096` or :code:`0x1000`, or a percentage of the source such as :code:`50%`
+        """
+        if self.source is None:
+            return
+        target = target.strip()
+        try:
+            if target.endswith("%"):
+                offset = int(self.source.size * float(target[:-1]) / 100)
+            else:
+                offset = int(target, 0)
+        except (ValueError, OverflowError):
+            # Anything typed at the prompt can end up here, including "inf%"
+            return
+        offset = min(max(offset, 0), max(self.source.size - 1, 0))
+        # Read-ahead queued for the old position would hold up reading the target page
+        self.source.cancel_prefetch()
+        self.pending_delta = 0
+        self.pending_scroll = 0
+        self.cursor = self.source.next_mapped(offset, 1)
+        row_bytes = self._page_geometry()[0]
+        self.offset = self.cursor - self.cursor % row_bytes
+        self._drawn_offset = self.offset
+
+    def draw(self):
+        self.erase()
+        if self.text_window is not None:
+            self.text_window.erase()
+        if self.source is None:
+            return
+        if self.pending_delta or self.pending_scroll:
+            self.scroll(self.pending_scroll)
+            self.move_cursor(self.pending_delta)
+            self.pending_delta = 0
+            self.pending_scroll = 0
+        row_bytes, rows, page_bytes = self._page_geometry()
+        # Switching mode or resizing can shrink the page and leave the cursor below it
+        self._scroll_to_cursor()
+        # Everything is clipped to the window, rows can be wider than narrow panes and short terminals
+        # don't leave room for the whole inspector
+        lines, cols = self.window.getmaxyx()
+        mode = self.mode if self.mode in DataInspector.FORMATS else "hex"
+        header = "{} {}  0x{:08X}".format(self.mode, DataInspector.ENDIANNESS[self.endian], self.cursor)
+        self.window.addnstr(0, 0, header, cols - 1, curses.A_BOLD)
+
+        page = self.source.read(self.offset, page_bytes)
+        holes = self.source.holes(self.offset, page_bytes)
+        for y, (typed, text) in enumerate(DataInspector.format_page(page, mode, self.endian, row_bytes, holes), 1):
+            if y >= lines:
+                break
+            self.window.addnstr(y, 0, typed, cols - 1)
+            if self.text_window is not None and y < self.text_window.window.getmaxyx()[0]:
+                self.text_window.window.addnstr(y, 0, text, self.text_window.window.getmaxyx()[1] - 1)
+
+        # Highlight the cell under the cursor
+        code, cell_width, _ = DataInspector.FORMATS[mode]
+        index = (self.cursor - self.offset) // struct.calcsize(code)
+        per_row = row_bytes // struct.calcsize(code)
+        cursor_y, cursor_x = 1 + index // per_row, (index % per_row) * (cell_width + 1)
+        if 0 <= self.cursor - self.offset < len(page) and cursor_y < lines and cursor_x < cols - 1:
+            self.window.chgat(cursor_y, cursor_x, min(cell_width, cols - 1 - cursor_x), curses.A_REVERSE)
+
+        if self.mode == "inspector":
+            data = self.source.read(self.cursor, 8)
+            cursor_holes = self.source.holes(self.cursor, 8)
+            if cursor_holes:
+                data = data[:cursor_holes[0][0]]
+            for y, line in enumerate(DataInspector.inspect(data, self.endian), rows + 2):
+                if y >= lines:
+                    break
+                self.window.addnstr(y, 0, line, cols - 1)
+
+        # Read ahead in the direction we're scrolling
+        delta = self.offset - self._drawn_offset
+        self.source.prefetch(self.offset, page_bytes, (delta > 0) - (delta < 0))
+        self._drawn_offset = self.offset
+
+
 def setup_curses():  # Tuple[curses._CursesWindow]
     app = App(True, True)
     app.add_new_window("root", curses.COLS, curses.LINES, 0, 0)
     root = app.windows['root']
     root.panel.bottom()
-    hex_v = root.add_subwindow("hex", (curses.COLS // 3) * 2, curses.LINES - 2, 0, 0)
+    hex_v = root.add_subwindow("hex", (curses.COLS // 3) * 2, curses.LINES - 2, 0, 0, window_cls=HexWindow)
     text_v = root.add_subwindow("text", curses.COLS // 3, curses.LINES - 2, 0, (curses.COLS // 3) * 2)
+    hex_v.text_window = text_v
     app.menubar.add_item("File", {
         "Open": None,
         "Save": None,
@@ -454,17 +1082,36 @@ def setup_curses():  # Tuple[curses._CursesWindow]
     }, curses.KEY_F10)
     app.menubar.add_item("Test2", {"Test": None}, curses.KEY_F9)
     app.footerbar.set_background_colour(254)
+    app.footerbar.add_item("Mode", functools.partial(hex_v.cycle_mode), ord("m"))
+    app.footerbar.add_item("Endian", functools.partial(hex_v.toggle_endian), ord("e"))
+    app.footerbar.add_item("Reload", functools.partial(hex_v.reload), ord("r"))
+    app.footerbar.add_item("Goto", lambda: hex_v.goto(app.footerbar.prompt("Goto offset or %: ")), ord("g"))
+    for key, handler in {
+        curses.KEY_UP: functools.partial(hex_v.move_rows, -1),
+        curses.KEY_DOWN: functools.partial(hex_v.move_rows, 1),
+        curses.KEY_LEFT: functools.partial(hex_v.move_items, -1),
+        curses.KEY_RIGHT: functools.partial(hex_v.move_items, 1),
+        curses.KEY_PPAGE: functools.partial(hex_v.move_pages, -1),
+        curses.KEY_NPAGE: functools.partial(hex_v.move_pages, 1),
+    }.items():
+        app.shortcut_manager.add_shortcut(key, handler, None)
     return app
 
 
 if __name__ == "__main__":
+    source = None
     try:
         root = setup_curses()
         root.refresh()
-        root.windows['root'].sub_windows['hex'].add_str("BOBBB")
+        if len(sys.argv) > 1:
+            source = open_source(sys.argv[1])
+            root.windows['root'].sub_windows['hex'].set_source(source)
         loop = asyncio.get_event_loop()
         loop.run_until_complete(root.run())
     finally:
         curses.echo()
         curses.cbreak()
         curses.endwin()
+        # Cancels queued read-ahead, the prefetch thread would otherwise keep the interpreter alive
+        if source is not None:
+            source.close()
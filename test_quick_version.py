@@ -0,0 +1,265 @@
+import atexit
+import subprocess
+import sys
+import curses
+import functools
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import quick_version
+from quick_version import DataInspector, DataSource, FileSource, HexWindow, ProcessMemorySource, ShortcutManager
+
+# Importing quick_version registers the curses cleanup, which fails when curses was never started
+atexit.unregister(quick_version.App._cleanup)
+
+MARKER = b"PYXDUMP-TEST-MARKER"
+
+
+class HoleySource(DataSource):
+    """Every odd block is a hole"""
+    def __init__(self, blocks: int):
+        super(HoleySource, self).__init__()
+        self.size = blocks * self.BLOCK_SIZE
+
+    def _read_block(self, index):
+        return None if index % 2 else bytes([index + 1]) * self.BLOCK_SIZE
+
+
+def test_file_source_read(tmp_path):
+    path = tmp_path / "data.bin"
+    data = bytes(range(256)) * 20
+    path.write_bytes(data)
+    source = FileSource(str(path))
+    try:
+        assert source.read(0, 16) == data[:16]
+        assert source.read(4090, 20) == data[4090:4110]
+        assert source.read(len(data) - 4, 100) == data[-4:]
+        assert source.read(len(data), 10) == b""
+        assert source.holes(0, len(data)) == ()
+    finally:
+        source.close()
+
+
+def test_holes_are_zero_filled_and_merged():
+    source = HoleySource(4)
+    size = source.BLOCK_SIZE
+    try:
+        data = source.read(size - 8, 16)
+        assert data == b"\x01" * 8 + bytes(8)
+        assert source.holes(size - 8, 16) == ((8, 16),)
+        assert source.holes(0, 4 * size) == ((size, 2 * size), (3 * size, 4 * size))
+    finally:
+        source.close()
+
+
+def test_invalidate_discards_in_flight_read():
+    started, release = threading.Event(), threading.Event()
+
+    class SlowSource(HoleySource):
+        generation = b"\x01"
+
+        def _read_block(self, index):
+            data = self.generation * self.BLOCK_SIZE
+            if index == 1:
+                started.set()
+                release.wait(5)
+            return data
+
+    source = SlowSource(4)
+    try:
+        source.prefetch(0, source.BLOCK_SIZE, 1)
+        assert started.wait(5)
+        source.generation = b"\x02"
+        source.invalidate()
+        release.set()
+        assert source.read(source.BLOCK_SIZE, 1) == b"\x02"
+    finally:
+        release.set()
+        source.close()
+
+
+def test_format_page_holes():
+    page = bytes(range(16)) * 2
+    rows = DataInspector.format_page(page, "hex", "<", 16, ((16, 20),))
+    assert rows[0][0] == " ".join("{:02X}".format(b) for b in range(16))
+    assert rows[1][0].split(" ")[:5] == ["??", "??", "??", "??", "04"]
+    assert rows[1][1].startswith("    ")
+    rows = DataInspector.format_page(page, "int32", "<", 16, ((4, 8),))
+    assert rows[0][0].split() == ["50462976", "??", "185207048", "252579084"]
+
+
+class StubWindow:
+    """Stands in for a curses window, drawing does nothing"""
+    def __init__(self, lines: int, cols: int):
+        self.size = lines, cols
+
+    def getmaxyx(self):
+        return self.size
+
+    def __getattr__(self, name):
+        return lambda *args: None
+
+
+def test_mode_switch_keeps_cursor_visible():
+    source = HoleySource(4)
+    view = HexWindow.from_derived_window(StubWindow(22, 52))
+    view.set_source(source)
+    try:
+        # 21 rows of 16 bytes, move the cursor down near the bottom
+        view.move_rows(18)
+        view.draw()
+        assert (view.cursor, view.offset) == (288, 0)
+        for mode in ("int8", "inspector"):
+            view.mode = mode
+            view.draw()
+            row_bytes, _, page_bytes = view._page_geometry()
+            assert view.offset <= view.cursor < view.offset + page_bytes
+            assert view.offset % row_bytes == 0
+    finally:
+        source.close()
+
+
+def test_queued_page_downs_are_coalesced():
+    source = HoleySource(16)
+    view = HexWindow.from_derived_window(StubWindow(22, 52))
+    view.set_source(source)
+    keys = []
+    manager = ShortcutManager(SimpleNamespace(getch=lambda blocking=True, timeout=None: keys.pop(0) if keys else -1))
+    manager.add_shortcut(curses.KEY_NPAGE, functools.partial(view.move_pages, 1), None)
+    try:
+        page_bytes = view._page_geometry()[2]
+        keys.extend([curses.KEY_NPAGE] * 5)
+        manager.check_shortcuts()
+        assert keys == []
+        view.draw()
+        assert (view.cursor, view.offset) == (5 * page_bytes, 5 * page_bytes)
+        # A frame with no keys leaves the view where it was
+        manager.check_shortcuts()
+        view.draw()
+        assert (view.cursor, view.offset) == (5 * page_bytes, 5 * page_bytes)
+    finally:
+        source.close()
+
+
+def test_page_down_scrolls_a_page():
+    source = HoleySource(1)
+    view = HexWindow.from_derived_window(StubWindow(22, 52))
+    view.set_source(source)
+    try:
+        page_bytes = view._page_geometry()[2]
+        view.move_pages(1)
+        view.draw()
+        assert (view.cursor, view.offset) == (page_bytes, page_bytes)
+        # The last page stays full rather than scrolling past the end
+        view.move_pages(100)
+        view.draw()
+        assert view.cursor == source.size - 1
+        assert view.offset == source.size - page_bytes
+    finally:
+        source.close()
+
+
+def test_goto():
+    source = HoleySource(4)
+    # goto only needs the window size
+    view = HexWindow.from_derived_window(SimpleNamespace(getmaxyx=lambda: (24, 53)))
+    view.set_source(source)
+    try:
+        view.goto("0x1010")
+        assert (view.cursor, view.offset) == (0x1010, 0x1010)
+        view.goto("50%")
+        assert view.cursor == 2 * source.BLOCK_SIZE
+        view.goto("1000%")
+        assert view.cursor == source.size - 1
+        for target in ("inf%", "1e400%", "nan%", "bogus", ""):
+            view.goto(target)
+            assert view.cursor == source.size - 1
+    finally:
+        source.close()
+
+
+def test_prefetch_cancels_outside_window():
+    release = threading.Event()
+
+    class BlockedSource(HoleySource):
+        def _read_block(self, index):
+            release.wait(5)
+            return super(BlockedSource, self)._read_block(index)
+
+    source = BlockedSource(64)
+    try:
+        # Block 1 is read first and holds up the worker, everything else stays queued
+        source.prefetch(0, source.BLOCK_SIZE, 1)
+        assert set(source._pending) == set(range(1, 17))
+        source.prefetch(source.BLOCK_SIZE, source.BLOCK_SIZE, 1)
+        assert set(source._pending) == set(range(2, 18))
+        source.prefetch(32 * source.BLOCK_SIZE, source.BLOCK_SIZE, -1)
+        assert set(source._pending) == set(range(16, 32))
+    finally:
+        release.set()
+        source.close()
+
+
+@pytest.fixture
+def child():
+    process = subprocess.Popen(
+        [sys.executable, "-c", "import sys, time\nb = bytearray({!r} * 64)\nprint(flush=True)\ntime.sleep(60)".format(
+            MARKER)],
+        stdout=subprocess.PIPE)
+    process.stdout.readline()
+    yield process
+    process.kill()
+    process.wait()
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="needs /proc")
+def test_process_memory_source(child):
+    try:
+        source = ProcessMemorySource(child.pid)
+    except PermissionError:
+        pytest.skip("not allowed to read the memory of child processes")
+    try:
+        maps = source.maps
+        found = None
+        for start, end, path in maps:
+            if path not in ("", "[heap]"):
+                continue
+            for offset in range(start, end, source.BLOCK_SIZE):
+                index = source.read(offset, source.BLOCK_SIZE).find(MARKER)
+                if index >= 0:
+                    found = offset + index
+                    break
+            if found is not None:
+                break
+        assert found is not None
+        assert source.read(found, len(MARKER)) == MARKER
+
+        i = next(i for i in range(len(maps) - 1) if maps[i][1] != maps[i + 1][0])
+        gap_start, gap_end = maps[i][1], maps[i + 1][0]
+        assert source.holes(gap_start - 16, 32) == ((16, 32),)
+        assert source.read(gap_start, 16) == bytes(16)
+        assert source.next_mapped(gap_start, 1) == gap_end
+        assert source.next_mapped(gap_start, -1) == gap_start - 1
+        assert source.next_mapped(maps[0][0] - 1, -1) == maps[0][0]
+    finally:
+        source.close()
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="needs /proc")
+def test_process_memory_source_after_exit(child):
+    try:
+        source = ProcessMemorySource(child.pid)
+    except PermissionError:
+        pytest.skip("not allowed to read the memory of child processes")
+    try:
+        maps = source.maps
+        child.kill()
+        child.wait()
+        source.invalidate()
+        assert source.maps == maps
+        start = maps[0][0]
+        assert source.holes(start, 16) == ((0, 16),)
+    finally:
+        source.close()